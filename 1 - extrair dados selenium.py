@@ -1,13 +1,12 @@
 import pandas as pd
 import requests # Mantido para compatibilidade com session, embora não usado para chamadas API de dados
 import time
-import json
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from urllib.parse import urlparse, parse_qs, quote
+from urllib.parse import urlparse, parse_qs, urlencode
 import os
 import re
 
@@ -107,7 +106,23 @@ js_headers_para_fetch_obj = {
     'cache-control': 'no-cache',
     'pragma': 'no-cache'
 }
-js_headers_string_para_fetch = json.dumps(js_headers_para_fetch_obj)
+
+# Script de fetch montado uma única vez; URL e cabeçalhos chegam como argumentos do execute_async_script
+JS_FETCH_API = """
+    const url = arguments[0];
+    const headers = arguments[1];
+    const done = arguments[arguments.length - 1];
+    
+    fetch(url, { headers: headers, cache: "no-store" })
+        .then(response => {
+            const status = response.status;
+            if (!response.ok) {
+                return response.text().then(text => done({ error: `HTTP error!`, status: status, body: text.substring(0, 500) }));
+            }
+            return response.json().then(data => done({data: data, status: status}));
+        })
+        .catch(error => done({ error: error.toString(), status: 0 }));
+"""
 
 
 # --- Início do processamento da planilha Excel ---
@@ -117,17 +132,19 @@ try:
         lista_de_processos_total = df_entrada[nome_da_coluna_processos].astype(str).tolist()
         
         processos_ja_coletados = set()
+        df_existente = None # Mantido em memória para ser reaproveitado na hora de salvar
         if os.path.exists(nome_arquivo_saida):
             try:
                 print(f"Lendo arquivo de saída existente: {nome_arquivo_saida}")
                 df_existente = pd.read_excel(nome_arquivo_saida)
                 if 'processo_planilha' in df_existente.columns:
-                    processos_ja_coletados = set(df_existente['processo_planilha'].astype(str).tolist())
+                    processos_ja_coletados = set(df_existente['processo_planilha'].astype(str)) # set direto da Series, sem lista intermediária
                 print(f"{len(processos_ja_coletados)} processos já encontrados no arquivo de saída.")
             except Exception as e_read_exist:
                 print(f"Erro ao ler arquivo de saída existente: {e_read_exist}. Começando do zero ou apenas com novos.")
         
-        lista_de_processos_a_fazer = [p for p in lista_de_processos_total if p not in processos_ja_coletados]
+        # dict.fromkeys remove números repetidos na planilha (mantendo a ordem), evitando consultar a API duas vezes pelo mesmo processo
+        lista_de_processos_a_fazer = [p for p in dict.fromkeys(lista_de_processos_total) if p not in processos_ja_coletados]
         
         if not lista_de_processos_a_fazer:
              print("Todos os processos da planilha já foram coletados anteriormente.")
@@ -138,6 +155,7 @@ try:
             print(f"Processando {len(lista_de_processos_a_fazer)} processos restantes.")
 
         colecoes_a_pesquisar = ['acordaos', 'sentencas'] 
+        selenium_driver.set_script_timeout(40) # Vale para a sessão inteira; configurado uma vez antes do laço de fetch
         print(f"\nUsando para API: sessionId='{auto_session_id}', juristkn='{manual_juristkn_para_sessao_atual}'")
 
         for indice, numero_processo_original in enumerate(lista_de_processos_a_fazer):
@@ -150,31 +168,19 @@ try:
                 print(f"  Buscando na coleção: '{nome_colecao}'...")
                 
                 # Reduzido para size=10 (ou 5), pois 50 deu erro de permissão. Ajuste conforme necessário.
-                params_string = f"texto={quote(numero_processo_original)}&colecao={nome_colecao}&page=0&size=10&pesquisaSomenteNasEmentas=false&verTodosPrecedentes=false&tribunais=&sessionId={auto_session_id}&juristkn={manual_juristkn_para_sessao_atual}"
+                params_string = urlencode({
+                    'texto': numero_processo_original, 'colecao': nome_colecao,
+                    'page': 0, 'size': 10,
+                    'pesquisaSomenteNasEmentas': 'false', 'verTodosPrecedentes': 'false', 'tribunais': '',
+                    'sessionId': auto_session_id, 'juristkn': manual_juristkn_para_sessao_atual
+                })
                 url_api_completa_para_fetch = f"https://jurisprudencia.jt.jus.br/jurisprudencia-nacional-backend/api/no-auth/pesquisa?{params_string}"
                 
                 # print(f"    Executando fetch via Selenium para URL (início): {url_api_completa_para_fetch[:120]}...")
-
-                javascript_code = f"""
-                    const url = '{url_api_completa_para_fetch}';
-                    const headers = {js_headers_string_para_fetch}; 
-                    const done = arguments[arguments.length - 1];
-                    
-                    fetch(url, {{ headers: headers, cache: "no-store" }})
-                        .then(response => {{
-                            const status = response.status;
-                            if (!response.ok) {{
-                                return response.text().then(text => done({{ error: `HTTP error!`, status: status, body: text.substring(0, 500) }}));
-                            }}
-                            return response.json().then(data => done({{data: data, status: status}}));
-                        }})
-                        .catch(error => done({{ error: error.toString(), status: 0 }}));
-                """
                 
                 dados_api = None
                 try:
-                    selenium_driver.set_script_timeout(40) 
-                    dados_api = selenium_driver.execute_async_script(javascript_code)
+                    dados_api = selenium_driver.execute_async_script(JS_FETCH_API, url_api_completa_para_fetch, js_headers_para_fetch_obj)
                 except Exception as e_fetch:
                     print(f"    ERRO ao executar fetch no Selenium: {e_fetch}")
                     dados_api = {"error": str(e_fetch), "status": 0}
@@ -245,7 +251,7 @@ try:
             if os.path.exists(nome_arquivo_saida) and not processos_ja_coletados: # Se o arquivo existe mas começamos do zero (ex: arquivo corrompido)
                  df_final = pd.DataFrame(dados_finais_coletados)
             elif os.path.exists(nome_arquivo_saida) and processos_ja_coletados:
-                df_antigo = pd.read_excel(nome_arquivo_saida)
+                df_antigo = df_existente # Já lido no início da execução; evita abrir a planilha de novo
                 df_novo = pd.DataFrame(dados_finais_coletados)
                 df_final = pd.concat([df_antigo, df_novo], ignore_index=True)
                 # Remover duplicatas caso algum processo tenha sido reprocessado por engano
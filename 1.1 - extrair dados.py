@@ -19,9 +19,10 @@ try:
         print(f"Colunas disponíveis: {df.columns.tolist()}")
         exit(1)
 
-    # Garante que cada número de processo é string
-    lista_de_processos = df[nome_da_coluna_processos].astype(str).tolist()
-    print(f"Sucesso! Fornecidos {len(lista_de_processos)} números de processo.")
+    # Garante que cada número de processo é string e descarta repetidos (mantendo a ordem),
+    # para não consultar a API duas vezes pelo mesmo processo
+    lista_de_processos = list(dict.fromkeys(df[nome_da_coluna_processos].astype(str)))
+    print(f"Sucesso! Fornecidos {len(lista_de_processos)} números de processo distintos.")
 
     colecoes_a_pesquisar = ['acordaos', 'sentencas']
 
@@ -31,6 +32,14 @@ try:
     seu_juristkn   = "784de2cc882300"   # Substitua pelo valor mais recente
     # --------------------------------------------------
 
+    # Uma única sessão HTTP para todas as consultas: reaproveita a conexão TCP/TLS
+    # com o servidor em vez de abrir uma nova a cada requisição
+    sessao_http = requests.Session()
+    sessao_http.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    })
+
     print("\nIniciando as consultas à API para todos os processos...")
     for indice, numero_processo_original in enumerate(lista_de_processos, start=1):
         print(f"\nProcessando {indice}/{len(lista_de_processos)}: {numero_processo_original}")
@@ -50,13 +59,9 @@ try:
                 'sessionId': seu_session_id,
                 'juristkn': seu_juristkn
             }
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
-                              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
 
             try:
-                response = requests.get(url_api, params=params, headers=headers, timeout=30)
+                response = sessao_http.get(url_api, params=params, timeout=30)
                 print(f"    → Status da resposta: {response.status_code}")
 
                 if not response.ok:
@@ -99,7 +104,7 @@ try:
                     texto_limpo = ""
                     if isinstance(texto_html, str) and texto_html.strip():
                         try:
-                            soup = BeautifulSoup(texto_html, 'html.parser')
+                            soup = BeautifulSoup(texto_html, 'lxml') # Parser em C (lxml), o mesmo usado na coleta via Selenium
                             texto_limpo = soup.get_text(separator=' ', strip=True)
                         except Exception as e_parse:
                             texto_limpo = f"Erro ao parsear HTML: {e_parse}"
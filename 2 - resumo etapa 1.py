@@ -7,7 +7,7 @@ import nltk
 # --- Bloco para baixar o 'punkt' do NLTK se necessário ---
 try:
     nltk.data.find('tokenizers/punkt')
-except nltk.downloader.DownloadError:
+except LookupError: # nltk.data.find sinaliza recurso ausente com LookupError
     print("Baixando o recurso 'punkt' do NLTK para tokenização de sentenças...")
     nltk.download('punkt')
     print("Download do 'punkt' concluído.")
@@ -40,6 +40,9 @@ sumarizador = TextRankSummarizer()
 tokenizer_portugues = SumyTokenizer("portuguese")
 
 resumos = []
+# O mesmo documento costuma voltar da API para mais de um processo pesquisado; como o TextRank é
+# determinístico, cada texto distinto é sumarizado uma vez só e o resultado é reaproveitado
+resumos_por_texto = {}
 
 # LIMITAR O PROCESSAMENTO ÀS PRIMEIRAS 5 LINHAS PARA TESTE INICIAL
 # Se quiser processar tudo, comente ou remova as duas linhas abaixo:
@@ -50,14 +53,20 @@ df_para_processar = df
 
 print(f"Iniciando sumarização para {len(df_para_processar)} textos...")
 
-for indice, linha in df_para_processar.iterrows():
-    texto_original = str(linha[coluna_texto_original]) # Garante que é string
+# Percorre só a coluna de texto (.items()), sem montar uma Series por linha como o iterrows()
+for indice, valor_texto in df_para_processar[coluna_texto_original].items():
+    texto_original = str(valor_texto) # Garante que é string
     
     if pd.isna(texto_original) or not texto_original.strip():
         print(f"  Linha {indice + 1}: Texto original vazio ou ausente. Pulando.")
         resumos.append("") # Adiciona resumo vazio
         continue
 
+    if texto_original in resumos_por_texto:
+        resumos.append(resumos_por_texto[texto_original])
+        print(f"  Linha {indice + 1}: Texto idêntico a uma linha anterior. Resumo reaproveitado.")
+        continue
+
     # Criar o parser para o texto atual
     parser = PlaintextParser.from_string(texto_original, tokenizer_portugues)
     
@@ -68,6 +77,7 @@ for indice, linha in df_para_processar.iterrows():
         # Juntar as frases do resumo em uma única string
         texto_resumido = " ".join([str(sentenca) for sentenca in resumo_sumy])
         resumos.append(texto_resumido)
+        resumos_por_texto[texto_original] = texto_resumido
         print(f"  Linha {indice + 1}: Resumo gerado ({len(texto_resumido)} chars).")
     except Exception as e_sumy:
         print(f"  Linha {indice + 1}: Erro ao sumarizar - {e_sumy}")
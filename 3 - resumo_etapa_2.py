@@ -8,7 +8,7 @@ import os # Necessário se for usar os.path.exists
 # --- Bloco para baixar o 'punkt' do NLTK se necessário ---
 try:
     nltk.data.find('tokenizers/punkt')
-except nltk.downloader.DownloadError:
+except LookupError: # nltk.data.find sinaliza recurso ausente com LookupError
     print("Baixando o recurso 'punkt' do NLTK para tokenização de sentenças...")
     nltk.download('punkt')
     print("Download do 'punkt' concluído.")
@@ -20,6 +20,7 @@ coluna_processo_original = "processo_planilha"
 coluna_resumos_individuais = "resumo_extrativo_sumy"
 coluna_data_julgamento = "data_julgamento_api" 
 coluna_novo_meta_resumo = "meta_resumo_filtrado" # Nome da nova coluna
+coluna_texto_completo = "texto_limpo_extraido" # Texto integral da coleta; não é usado aqui e não precisa ser carregado
 
 # Número de frases desejadas no META-RESUMO
 NUMERO_DE_FRASES_NO_META_RESUMO = 10 # Ajuste conforme sua necessidade
@@ -39,10 +40,12 @@ termos_processuais_para_filtrar = [
     "recurso de revista"
     # Cuidado com termos muito genéricos
 ]
+# Pares (termo original, termo em minúsculas) montados uma única vez, fora do laço de filtragem
+termos_processuais_minusculos = [(termo, termo.lower()) for termo in termos_processuais_para_filtrar]
 
 print(f"Lendo o arquivo com resumos individuais: {nome_arquivo_entrada_com_resumos}...")
 try:
-    df = pd.read_excel(nome_arquivo_entrada_com_resumos)
+    df = pd.read_excel(nome_arquivo_entrada_com_resumos, usecols=lambda coluna: coluna != coluna_texto_completo)
 except FileNotFoundError:
     print(f"ERRO: Arquivo '{nome_arquivo_entrada_com_resumos}' não encontrado.")
     exit()
@@ -57,12 +60,15 @@ for col in colunas_necessarias:
 print("Colunas necessárias encontradas.")
 
 df[coluna_data_julgamento] = pd.to_datetime(df[coluna_data_julgamento], errors='coerce', dayfirst=True)
+# Validade de cada resumo individual calculada de uma vez para a planilha inteira (vetorizado),
+# em vez de repetir dropna + strip dentro do laço para cada processo
+resumo_individual_valido = df[coluna_resumos_individuais].notna() & (df[coluna_resumos_individuais].str.strip() != '')
 agrupado_por_processo = df.groupby(coluna_processo_original)
 meta_resumos_finais = [] 
 sumarizador = TextRankSummarizer()
 tokenizer_portugues = SumyTokenizer("portuguese")
 
-total_processos_unicos = df[coluna_processo_original].nunique()
+total_processos_unicos = agrupado_por_processo.ngroups # Contagem sai do próprio agrupamento, sem outra passada com nunique()
 print(f"Iniciando a geração de meta-resumos para {total_processos_unicos} processos únicos...")
 
 contador_processos_processados = 0
@@ -70,8 +76,7 @@ for nome_processo, grupo in agrupado_por_processo:
     contador_processos_processados += 1
     print(f"\nProcessando meta-resumo para: {nome_processo} ({contador_processos_processados}/{total_processos_unicos})")
 
-    grupo_com_resumos_validos = grupo.dropna(subset=[coluna_resumos_individuais])
-    grupo_com_resumos_validos = grupo_com_resumos_validos[grupo_com_resumos_validos[coluna_resumos_individuais].str.strip() != '']
+    grupo_com_resumos_validos = grupo[resumo_individual_valido.loc[grupo.index]]
     
     if grupo_com_resumos_validos.empty:
         print(f"  Processo {nome_processo}: Nenhum resumo individual válido encontrado. Pulando meta-resumo.")
@@ -89,8 +94,9 @@ for nome_processo, grupo in agrupado_por_processo:
     
     for resumo_individual in resumos_individuais_originais_do_grupo:
         ignorar_este_resumo = False
-        for termo_processual in termos_processuais_para_filtrar:
-            if termo_processual.lower() in resumo_individual.lower():
+        resumo_minusculo = resumo_individual.lower()
+        for termo_processual, termo_minusculo in termos_processuais_minusculos:
+            if termo_minusculo in resumo_minusculo:
                 ignorar_este_resumo = True
                 print(f"      -> Resumo individual (início: '{resumo_individual[:70]}...') ignorado por conter termo: '{termo_processual}'")
                 break 
@@ -7,13 +7,17 @@ import os
 
 # --- Bloco para baixar 'punkt' e 'stopwords' do NLTK se necessário ---
 recursos_nltk = {"tokenizers/punkt": "punkt", "corpora/stopwords": "stopwords"}
+recursos_faltando = []
 for recurso_path, recurso_nome in recursos_nltk.items():
     try:
         nltk.data.find(recurso_path)
-    except nltk.downloader.DownloadError:
-        print(f"Baixando o recurso '{recurso_nome}' do NLTK...")
-        nltk.download(recurso_nome)
-        print(f"Download de '{recurso_nome}' concluído.")
+    except LookupError: # nltk.data.find sinaliza recurso ausente com LookupError
+        recursos_faltando.append(recurso_nome)
+if recursos_faltando:
+    # Uma única chamada ao downloader para todos os recursos ausentes
+    print(f"Baixando os recursos {recursos_faltando} do NLTK...")
+    nltk.download(recursos_faltando)
+    print(f"Download de {recursos_faltando} concluído.")
 # --- Fim do bloco de download ---
 
 
@@ -22,6 +26,8 @@ nome_arquivo_entrada = "processos_com_META_RESUMOS_FILTRADOS.xlsx"
 coluna_processo_original = "processo_planilha" 
 coluna_texto_para_resumir = "meta_resumo_filtrado"
 coluna_novo_resumo_abstractivo = "tema_fundo_stjiris_t5" # Novo nome de coluna
+# Mensagens gravadas pela etapa anterior no lugar do meta-resumo; linhas com elas não vão ao modelo
+MARCADORES_ENTRADA_INVALIDA = ("Erro", "Sem resumos individuais válidos", "Texto concatenado dos resumos vazio")
 
 # --- Configurações do Modelo de Sumarização ---
 NOME_MODELO = "stjiris/t5-portuguese-legal-summarization" # <<< SEU NOVO MODELO ESCOLHIDO
@@ -32,20 +38,10 @@ MAX_COMPRIMENTO_RESUMO = 500 # AJUSTADO: Máximo de tokens (para um resumo conci
 NUM_BEAMS = 4 
 NO_REPEAT_NGRAM_SIZE = 2 # Para evitar repetição de bigramas
 EARLY_STOPPING = True
+TAMANHO_LOTE = 4 # Quantos meta-resumos são enviados ao modelo em cada chamada de generate
 
-print(f"Carregando o modelo de sumarização abstractiva '{NOME_MODELO}' e o tokenizer...")
-print("Este processo pode levar alguns minutos na primeira vez (download do modelo).")
-try:
-    # Usar as classes específicas T5Tokenizer e T5ForConditionalGeneration
-    tokenizer = AutoTokenizer.from_pretrained(NOME_MODELO) 
-    model = T5ForConditionalGeneration.from_pretrained(NOME_MODELO)
-    print("Modelo e tokenizer carregados com sucesso!")
-except Exception as e_load_model:
-    print(f"ERRO CRÍTICO ao carregar o modelo/tokenizer: {e_load_model}")
-    print(f"Verifique o nome do modelo ('{NOME_MODELO}') e sua conexão com a internet.")
-    print("Certifique-se de que 'transformers' e 'torch' estão instalados: pip install transformers torch")
-    exit()
-
+# A planilha é lida e validada antes de carregar o modelo: se a entrada estiver errada,
+# o script termina sem gastar tempo (e memória) com o download/carga do T5
 print(f"\nLendo o arquivo com meta-resumos: {nome_arquivo_entrada}...")
 try:
     df = pd.read_excel(nome_arquivo_entrada)
@@ -60,7 +56,19 @@ if coluna_texto_para_resumir not in df.columns:
 
 print(f"Coluna '{coluna_texto_para_resumir}' encontrada.")
 
-resumos_abstractivos_finais = []
+print(f"\nCarregando o modelo de sumarização abstractiva '{NOME_MODELO}' e o tokenizer...")
+print("Este processo pode levar alguns minutos na primeira vez (download do modelo).")
+try:
+    # Usar as classes específicas T5Tokenizer e T5ForConditionalGeneration
+    tokenizer = AutoTokenizer.from_pretrained(NOME_MODELO) 
+    model = T5ForConditionalGeneration.from_pretrained(NOME_MODELO)
+    print("Modelo e tokenizer carregados com sucesso!")
+except Exception as e_load_model:
+    print(f"ERRO CRÍTICO ao carregar o modelo/tokenizer: {e_load_model}")
+    print(f"Verifique o nome do modelo ('{NOME_MODELO}') e sua conexão com a internet.")
+    print("Certifique-se de que 'transformers' e 'torch' estão instalados: pip install transformers torch")
+    exit()
+
 NUM_LINHAS_TESTE = 3 
 print(f"\nAVISO: Processando apenas as primeiras {NUM_LINHAS_TESTE} linhas para teste inicial.")
 df_para_processar = df.head(NUM_LINHAS_TESTE)
@@ -70,51 +78,81 @@ df_para_processar = df.head(NUM_LINHAS_TESTE)
 total_textos_para_processar = len(df_para_processar)
 print(f"Iniciando sumarização abstractiva para {total_textos_para_processar} meta-resumos...")
 
-for indice, linha in df_para_processar.iterrows():
-    indice_original_df = linha.name 
-    processo_id_original = str(linha.get(coluna_processo_original, f"Linha {indice_original_df}"))
-    texto_original_para_resumo = str(linha[coluna_texto_para_resumir])
-    
-    print(f"\n  Processando meta-resumo do processo: {processo_id_original} ({df_para_processar.index.get_loc(indice_original_df) + 1}/{total_textos_para_processar})")
+# Primeiro passo: valida as entradas e separa os textos que realmente irão para o modelo
+resumos_abstractivos_finais = [None] * total_textos_para_processar
+textos_validos = [] # (posição na lista de resumos, processo, texto com prefixo)
+
+# Lê as duas colunas por posição (sem iterrows), evitando montar uma Series por linha
+tem_coluna_processo = coluna_processo_original in df_para_processar.columns
+processos_da_planilha = df_para_processar[coluna_processo_original].tolist() if tem_coluna_processo else None
+
+for posicao, (indice_original_df, valor_texto) in enumerate(df_para_processar[coluna_texto_para_resumir].items()):
+    processo_id_original = str(processos_da_planilha[posicao]) if tem_coluna_processo else f"Linha {indice_original_df}"
+    texto_original_para_resumo = str(valor_texto)
 
     if pd.isna(texto_original_para_resumo) or not texto_original_para_resumo.strip() or \
-       "Erro" in texto_original_para_resumo or \
-       "Sem resumos individuais válidos" in texto_original_para_resumo or \
-       "Texto concatenado dos resumos vazio" in texto_original_para_resumo:
-        print(f"    -> Texto de entrada para {processo_id_original} inválido ou é uma mensagem de erro. Pulando.")
-        resumos_abstractivos_finais.append("Entrada inválida para resumo abstractivo")
+       any(marcador in texto_original_para_resumo for marcador in MARCADORES_ENTRADA_INVALIDA):
+        print(f"    -> Texto de entrada para {processo_id_original} ({posicao + 1}/{total_textos_para_processar}) inválido ou é uma mensagem de erro. Pulando.")
+        resumos_abstractivos_finais[posicao] = "Entrada inválida para resumo abstractivo"
         continue
 
-    try:
-        # O prefixo "summarize: " é comum para modelos T5 afinados para sumarização
-        input_text_com_prefixo = "summarize: " + texto_original_para_resumo
-
-        # Tokenizar o texto
-        # max_length=1024 é um limite comum para T5, mas pode ser ajustado se os meta-resumos forem menores.
-        # O modelo stjiris/t5-portuguese-legal-summarization pode ter sido treinado com um max_length específico.
-        # Vamos usar 1024 por segurança, mas o ideal seria verificar a documentação do modelo.
-        tokenized_text_ids = tokenizer.encode(input_text_com_prefixo, return_tensors="pt", max_length=1024, truncation=True)
-        
-        # Gerar os IDs do resumo
-        summary_ids = model.generate(
-            tokenized_text_ids, 
-            num_beams=NUM_BEAMS, 
-            no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
-            min_length=MIN_COMPRIMENTO_RESUMO, 
-            max_length=MAX_COMPRIMENTO_RESUMO, 
-            early_stopping=EARLY_STOPPING
-        )
-        
-        # Decodificar os IDs de volta para texto
-        resumo_gerado = tokenizer.decode(summary_ids[0], skip_special_tokens=True, clean_up_tokenization_spaces=True)
-        resumos_abstractivos_finais.append(resumo_gerado)
-        print(f"    -> Tema de fundo (STJIRIS T5): \"{resumo_gerado}\"")
-
-    except Exception as e_summarize_abstractive:
-        print(f"    ERRO ao gerar resumo abstractivo para processo {processo_id_original}: {e_summarize_abstractive}")
-        resumos_abstractivos_finais.append("Erro na sumarização abstractiva")
+    # O prefixo "summarize: " é comum para modelos T5 afinados para sumarização
+    textos_validos.append((posicao, processo_id_original, "summarize: " + texto_original_para_resumo))
+
+# --- Função que gera os resumos para uma lista de textos (um lote ou um texto só) ---
+def gerar_resumos(textos):
+    # Tokenizar os textos de uma vez (com padding para alinhar os tamanhos)
+    # max_length=1024 é um limite comum para T5, mas pode ser ajustado se os meta-resumos forem menores.
+    # O modelo stjiris/t5-portuguese-legal-summarization pode ter sido treinado com um max_length específico.
+    # Vamos usar 1024 por segurança, mas o ideal seria verificar a documentação do modelo.
+    entradas_tokenizadas = tokenizer(textos, return_tensors="pt", max_length=1024, truncation=True, padding=True)
     
-    time.sleep(0.2) # Pequena pausa
+    # Gerar os IDs dos resumos
+    summary_ids = model.generate(
+        **entradas_tokenizadas,
+        num_beams=NUM_BEAMS, 
+        no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
+        min_length=MIN_COMPRIMENTO_RESUMO, 
+        max_length=MAX_COMPRIMENTO_RESUMO, 
+        early_stopping=EARLY_STOPPING
+    )
+    
+    # Decodificar os IDs de volta para texto
+    return tokenizer.batch_decode(summary_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+
+# Segundo passo: gera os resumos em lotes, uma chamada ao modelo por lote
+inicio_geracao_ns = time.perf_counter_ns()
+for inicio_lote in range(0, len(textos_validos), TAMANHO_LOTE):
+    lote = textos_validos[inicio_lote:inicio_lote + TAMANHO_LOTE]
+    processos_do_lote = [processo for _, processo, _ in lote]
+    print(f"\n  Processando lote com {len(lote)} meta-resumo(s): {', '.join(processos_do_lote)}")
+
+    try:
+        resumos_gerados = gerar_resumos([texto for _, _, texto in lote])
+        for (posicao, processo_id_original, _), resumo_gerado in zip(lote, resumos_gerados):
+            resumos_abstractivos_finais[posicao] = resumo_gerado
+            print(f"    -> Tema de fundo (STJIRIS T5) para {processo_id_original}: \"{resumo_gerado}\"")
+
+    except Exception as e_summarize_lote:
+        # Falha no lote (ex.: falta de memória): refaz um texto por vez, para que só as linhas
+        # que realmente falham recebam a mensagem de erro
+        print(f"    ERRO ao gerar resumos abstractivos para o lote ({', '.join(processos_do_lote)}): {e_summarize_lote}")
+        print("    Tentando novamente um meta-resumo por vez...")
+        for posicao, processo_id_original, texto in lote:
+            try:
+                resumo_gerado = gerar_resumos([texto])[0]
+                resumos_abstractivos_finais[posicao] = resumo_gerado
+                print(f"    -> Tema de fundo (STJIRIS T5) para {processo_id_original}: \"{resumo_gerado}\"")
+            except Exception as e_summarize_abstractive:
+                print(f"    ERRO ao gerar resumo abstractivo para processo {processo_id_original}: {e_summarize_abstractive}")
+                resumos_abstractivos_finais[posicao] = "Erro na sumarização abstractiva"
+
+# Tempo medido uma única vez em torno de toda a geração, em vez de por item
+if textos_validos:
+    tempo_geracao_ns = time.perf_counter_ns() - inicio_geracao_ns
+    print(f"\nGeração concluída: {len(textos_validos)} meta-resumos em {tempo_geracao_ns / 1e9:.1f}s "
+          f"(média: {tempo_geracao_ns / 1e6 / len(textos_validos):.0f} ms/meta-resumo, "
+          f"throughput: {len(textos_validos) * 1e9 / tempo_geracao_ns:.2f} meta-resumos/s)")
 
 # Lógica para adicionar a coluna de resumos ao DataFrame
 if len(resumos_abstractivos_finais) == len(df_para_processar):
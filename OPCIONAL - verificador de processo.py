@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+import re
 
 # --- Nomes dos arquivos e colunas ---
 # Substitua pelos nomes exatos dos seus arquivos, se forem diferentes.
@@ -13,12 +14,14 @@ col_resumo_individual = "resumo_extrativo_sumy" # Do arquivo_resumos_individuais
 col_meta_resumo = "meta_resumo_filtrado" # Do arquivo_meta_resumos
 
 # --- Função para carregar DataFrame e lidar com erros ---
-def carregar_df(nome_arquivo, col_processo):
+def carregar_df(nome_arquivo, col_processo, col_texto=None):
     if not os.path.exists(nome_arquivo):
         print(f"AVISO: Arquivo '{nome_arquivo}' não encontrado. Pulando análise deste arquivo.")
         return None, set()
     try:
-        df = pd.read_excel(nome_arquivo)
+        # Lê apenas as colunas usadas no diagnóstico; as demais (ex.: textos completos de outras etapas) são descartadas na leitura
+        colunas_usadas = {col_processo, col_texto}
+        df = pd.read_excel(nome_arquivo, usecols=lambda coluna: coluna in colunas_usadas)
         if col_processo not in df.columns:
             print(f"AVISO: Coluna '{col_processo}' não encontrada em '{nome_arquivo}'. Pulando.")
             return None, set()
@@ -30,18 +33,25 @@ def carregar_df(nome_arquivo, col_processo):
         print(f"Erro ao carregar ou processar '{nome_arquivo}': {e}")
         return None, set()
 
+# --- Função para marcar textos que contêm qualquer uma das mensagens de erro ---
+def contem_algum(textos, marcadores):
+    # Uma única expressão regular com todas as alternativas: percorre a coluna uma vez só,
+    # em vez de um str.contains separado para cada mensagem
+    padrao = "|".join(re.escape(marcador) for marcador in marcadores)
+    return textos.str.contains(padrao, case=False, na=False, regex=True)
+
 print("--- INÍCIO DO DIAGNÓSTICO DE CONTAGEM ---")
 
 # 1. Análise do arquivo da coleta da API
 print(f"\n1. Analisando arquivo de coleta da API: '{arquivo_dados_coletados_api}'")
-df_coleta_api, processos_na_coleta = carregar_df(arquivo_dados_coletados_api, col_processo_original)
+df_coleta_api, processos_na_coleta = carregar_df(arquivo_dados_coletados_api, col_processo_original, col_texto_limpo_coletado)
 processos_com_texto_valido_na_coleta = set()
 if df_coleta_api is not None and col_texto_limpo_coletado in df_coleta_api.columns:
+    textos_coletados = df_coleta_api[col_texto_limpo_coletado].astype(str) # Conversão feita uma vez só e reaproveitada pelos filtros
     df_com_texto = df_coleta_api[
         df_coleta_api[col_texto_limpo_coletado].notna() &
-        (df_coleta_api[col_texto_limpo_coletado].astype(str).str.strip() != "") &
-        (~df_coleta_api[col_texto_limpo_coletado].astype(str).str.contains("Erro ao parsear HTML", case=False, na=False)) &
-        (~df_coleta_api[col_texto_limpo_coletado].astype(str).str.contains("Conteúdo HTML não era string", case=False, na=False))
+        (textos_coletados.str.strip() != "") &
+        (~contem_algum(textos_coletados, ["Erro ao parsear HTML", "Conteúdo HTML não era string"]))
     ]
     if not df_com_texto.empty:
         processos_com_texto_valido_na_coleta = set(df_com_texto[col_processo_original].dropna().astype(str).unique())
@@ -53,14 +63,14 @@ if df_coleta_api is not None and col_texto_limpo_coletado in df_coleta_api.colum
 
 # 2. Análise do arquivo de resumos individuais
 print(f"\n2. Analisando arquivo de resumos individuais: '{arquivo_resumos_individuais}'")
-df_res_individuais, processos_no_resumo_individual = carregar_df(arquivo_resumos_individuais, col_processo_original)
+df_res_individuais, processos_no_resumo_individual = carregar_df(arquivo_resumos_individuais, col_processo_original, col_resumo_individual)
 processos_com_resumo_individual_valido = set()
 if df_res_individuais is not None and col_resumo_individual in df_res_individuais.columns:
+    textos_resumos = df_res_individuais[col_resumo_individual].astype(str)
     df_com_res_ind = df_res_individuais[
         df_res_individuais[col_resumo_individual].notna() &
-        (df_res_individuais[col_resumo_individual].astype(str).str.strip() != "") &
-        (~df_res_individuais[col_resumo_individual].astype(str).str.contains("Erro na sumarização", case=False, na=False)) &
-        (~df_res_individuais[col_resumo_individual].astype(str).str.contains("Texto original vazio", case=False, na=False))
+        (textos_resumos.str.strip() != "") &
+        (~contem_algum(textos_resumos, ["Erro na sumarização", "Texto original vazio"]))
     ]
     if not df_com_res_ind.empty:
         # Agrupa para garantir que o processo tenha pelo menos UM resumo individual válido.
@@ -75,15 +85,14 @@ if df_res_individuais is not None and col_resumo_individual in df_res_individuai
 
 # 3. Análise do arquivo de meta-resumos
 print(f"\n3. Analisando arquivo de meta-resumos: '{arquivo_meta_resumos}'")
-df_meta, processos_no_meta_resumo = carregar_df(arquivo_meta_resumos, col_processo_original)
+df_meta, processos_no_meta_resumo = carregar_df(arquivo_meta_resumos, col_processo_original, col_meta_resumo)
 processos_com_meta_resumo_valido = set()
 if df_meta is not None and col_meta_resumo in df_meta.columns:
+    textos_meta = df_meta[col_meta_resumo].astype(str)
     df_com_meta = df_meta[
         df_meta[col_meta_resumo].notna() &
-        (df_meta[col_meta_resumo].astype(str).str.strip() != "") &
-        (~df_meta[col_meta_resumo].astype(str).str.contains("Erro na meta-sumarização", case=False, na=False)) &
-        (~df_meta[col_meta_resumo].astype(str).str.contains("Sem resumos individuais válidos", case=False, na=False)) &
-        (~df_meta[col_meta_resumo].astype(str).str.contains("Texto concatenado dos resumos vazio", case=False, na=False))
+        (textos_meta.str.strip() != "") &
+        (~contem_algum(textos_meta, ["Erro na meta-sumarização", "Sem resumos individuais válidos", "Texto concatenado dos resumos vazio"]))
     ]
     if not df_com_meta.empty:
         processos_com_meta_resumo_valido = set(df_com_meta[col_processo_original].dropna().astype(str).unique())